@@ -31,9 +31,14 @@ class Settings(BaseSettings):
     # SSH Defaults
     ssh_key_path: Optional[str] = None
     ssh_timeout: int = 30
+    # Minimum seconds between package index refreshes (apt-get/apk update)
+    package_index_ttl_seconds: int = 600
 
     # Docker
     docker_timeout: int = 120
+    # Comma-separated registries with self-signed certificates; TLS is not
+    # verified for these (e.g. "registry.lan:5000,harbor.internal")
+    insecure_registries: str = ""
 
     # API
     api_v1_prefix: str = "/api/v1"
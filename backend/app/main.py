@@ -14,7 +14,9 @@ from fastapi.responses import FileResponse
 from app.config import get_settings
 from app.database import create_db_and_tables
 from app.routers import hosts_router, containers_router, system_router, scheduler_router
+from app.services.registry_service import RegistryService
 from app.services.scheduler_service import get_scheduler
+from app.services.ssh_pool import get_ssh_pool
 
 # Configure logging
 logging.basicConfig(
@@ -32,6 +34,7 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Update Dashboard...")
     await create_db_and_tables()
     logger.info("Database initialized")
+    await RegistryService.load_digest_cache()
 
     # Start auto-update scheduler
     scheduler = get_scheduler()
@@ -41,7 +44,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Update Dashboard...")
-    scheduler.stop()
+    await scheduler.stop()
+    await get_ssh_pool().close_all()
 
 
 # Create FastAPI app
@@ -4,5 +4,6 @@ Database models package.
 
 from app.models.host import Host
 from app.models.update_log import UpdateLog
+from app.models.registry_cache import RegistryDigestCache
 
-__all__ = ["Host", "UpdateLog"]
+__all__ = ["Host", "UpdateLog", "RegistryDigestCache"]
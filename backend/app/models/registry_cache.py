@@ -0,0 +1,25 @@
+"""
+Registry digest cache model for persisting remote digests across restarts.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class RegistryDigestCache(Base):
+    """Last known remote digest (and ETag) for an image reference."""
+
+    __tablename__ = "registry_digest_cache"
+
+    image: Mapped[str] = mapped_column(String(512), primary_key=True)
+    digest: Mapped[str] = mapped_column(String(128), nullable=False)
+    etag: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<RegistryDigestCache {self.image} {self.digest[:19]}>"
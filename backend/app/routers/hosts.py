@@ -227,9 +227,10 @@ async def get_host_status(host_id: int, db: AsyncSession = Depends(get_db)):
             if host.connection_type == ConnectionType.SSH:
                 from app.services.ssh_service import SSHService
 
+                ssh_service = SSHService(host, ssh_key, ssh_password)
                 try:
-                    ssh_service = SSHService(host, ssh_key, ssh_password)
-                    system_info = await ssh_service.get_system_info()
+                    # Must reach the host, so skip the cached system info
+                    system_info = await ssh_service.get_system_info(use_cache=False)
 
                     # Update last connected (SSH worked)
                     host.last_connected = datetime.utcnow()
@@ -246,6 +247,8 @@ async def get_host_status(host_id: int, db: AsyncSession = Depends(get_db)):
                 except Exception as ssh_error:
                     # Both failed
                     raise Exception(f"Docker: {docker_error}, SSH: {ssh_error}")
+                finally:
+                    await ssh_service.disconnect()
             else:
                 # Not SSH, so Docker error is fatal
                 raise docker_error
@@ -7,6 +7,7 @@ This is the most critical service in the application. It handles:
 - Updating containers while STRICTLY preserving all configuration
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple
@@ -263,6 +264,7 @@ class DockerService:
         host: Host,
         ssh_key: Optional[str] = None,
         ssh_password: Optional[str] = None,
+        ssh_client=None,
     ):
         """
         Initialize Docker service for a specific host.
@@ -271,12 +273,15 @@ class DockerService:
             host: Host model with connection details
             ssh_key: Decrypted SSH private key (if using SSH connection)
             ssh_password: Decrypted SSH password (if using password auth)
+            ssh_client: Already-connected paramiko client to reuse. It is
+                owned by the caller and left open on disconnect().
         """
         self.host = host
         self.ssh_key = ssh_key
         self.ssh_password = ssh_password
         self._client: Optional[DockerClient] = None
-        self._ssh_client = None
+        self._ssh_client = ssh_client
+        self._owns_ssh_client = ssh_client is None
         self._temp_socket_path = None
 
     async def connect(self) -> DockerClient:
@@ -294,37 +299,7 @@ class DockerService:
 
         try:
             if self.host.connection_type == ConnectionType.SSH:
-                # Use paramiko to execute docker commands over SSH
-                import paramiko
-
-                # Create SSH client with auto-add policy (no host key verification)
-                ssh_client = paramiko.SSHClient()
-                ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-                connect_kwargs = {
-                    "hostname": self.host.hostname,
-                    "port": self.host.ssh_port,
-                    "username": self.host.ssh_user,
-                    "allow_agent": False,
-                    "look_for_keys": False,
-                    "timeout": 30,
-                }
-
-                if self.ssh_key:
-                    # Load private key from string
-                    key = self._load_private_key(self.ssh_key)
-                    connect_kwargs["pkey"] = key
-                elif self.ssh_password:
-                    connect_kwargs["password"] = self.ssh_password
-                else:
-                    raise DockerException("No SSH credentials provided")
-
-                # Connect via SSH
-                logger.info(
-                    f"Connecting to {self.host.hostname}:{self.host.ssh_port} as {self.host.ssh_user}"
-                )
-                ssh_client.connect(**connect_kwargs)
-                self._ssh_client = ssh_client
+                ssh_client = await self.connect_ssh()
 
                 # Test Docker access via SSH
                 stdin, stdout, stderr = ssh_client.exec_command(
@@ -364,6 +339,53 @@ class DockerService:
             logger.error(f"Failed to connect to Docker on {self.host.name}: {e}")
             raise DockerException(str(e))
 
+    async def connect_ssh(self):
+        """
+        Open (or return the existing) paramiko SSH connection to the host.
+
+        The returned client can be shared with SSHService so container and
+        system checks run over a single SSH handshake.
+
+        Returns:
+            Connected paramiko SSHClient
+        """
+        if self._ssh_client is not None:
+            return self._ssh_client
+
+        # Use paramiko to execute docker commands over SSH
+        import paramiko
+
+        # Create SSH client with auto-add policy (no host key verification)
+        ssh_client = paramiko.SSHClient()
+        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        connect_kwargs = {
+            "hostname": self.host.hostname,
+            "port": self.host.ssh_port,
+            "username": self.host.ssh_user,
+            "allow_agent": False,
+            "look_for_keys": False,
+            "timeout": 30,
+        }
+
+        if self.ssh_key:
+            # Load private key from string
+            key = self._load_private_key(self.ssh_key)
+            connect_kwargs["pkey"] = key
+        elif self.ssh_password:
+            connect_kwargs["password"] = self.ssh_password
+        else:
+            raise DockerException("No SSH credentials provided")
+
+        # Connect via SSH
+        logger.info(
+            f"Connecting to {self.host.hostname}:{self.host.ssh_port} as {self.host.ssh_user}"
+        )
+        ssh_client.connect(**connect_kwargs)
+        self._ssh_client = ssh_client
+        self._owns_ssh_client = True
+        return ssh_client
+
     def _load_private_key(self, key_string: str):
         """Load SSH private key from string, trying multiple formats."""
         import paramiko
@@ -390,7 +412,7 @@ class DockerService:
             if hasattr(self._client, "close"):
                 self._client.close()
             self._client = None
-        if self._ssh_client:
+        if self._ssh_client and self._owns_ssh_client:
             self._ssh_client.close()
             self._ssh_client = None
 
@@ -527,12 +549,47 @@ class DockerService:
             restart_policy=restart_policy,
         )
 
+    async def pull_images_parallel(
+        self, images: List[str], max_streams: int = 4
+    ) -> Dict[str, Optional[str]]:
+        """
+        Pull several images concurrently.
+
+        Each pull runs on its own SSH channel (or API call for TCP hosts), so
+        the daemon downloads up to max_streams images at once instead of one
+        after another.
+
+        Args:
+            images: Image names to pull (duplicates are pulled once)
+            max_streams: Maximum number of concurrent pulls
+
+        Returns:
+            Dict of image name -> error message, or None if the pull succeeded
+        """
+        client = await self.connect()
+        semaphore = asyncio.Semaphore(max_streams)
+        unique_images = list(dict.fromkeys(images))
+
+        async def _pull(image: str) -> Optional[str]:
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(client.images.pull, image)
+                    return None
+                except Exception as e:
+                    return str(e)
+
+        errors = await asyncio.gather(*(_pull(image) for image in unique_images))
+        return dict(zip(unique_images, errors))
+
     async def update_container(
-        self, container_id: str, new_image: Optional[str] = None
+        self, container_id: str, new_image: Optional[str] = None, pull: bool = True
     ) -> ContainerUpdateResult:
         """
         Update a container to a new image while preserving configuration.
         Uses SSH to execute docker commands directly.
+
+        Set pull=False when the image was already pulled (e.g. with
+        pull_images_parallel).
         """
         logs = []
         client = await self.connect()
@@ -558,8 +615,11 @@ class DockerService:
 
             # 2. Pull new image
             logs.append(f"[2/7] Pulling image {new_image}...")
-            pulled_image = client.images.pull(new_image)
-            logs.append(f"    Pulled: {pulled_image.id[:12]}")
+            if pull:
+                pulled_image = client.images.pull(new_image)
+                logs.append(f"    Pulled: {pulled_image.id[:12]}")
+            else:
+                logs.append("    Skipped (already pulled)")
 
             # 3. Stop the old container
             logs.append(f"[3/7] Stopping container {container_name}...")
@@ -26,6 +26,9 @@ class NotificationService:
     COLOR_ERROR = 0xFF0000  # Red
     COLOR_INFO = 0x0099FF  # Blue
 
+    # Discord accepts at most 10 embeds per webhook message
+    MAX_EMBEDS_PER_MESSAGE = 10
+
     def __init__(self, webhook_url: Optional[str] = None):
         """
         Initialize notification service.
@@ -62,10 +65,18 @@ class NotificationService:
         Returns:
             True if sent successfully
         """
-        if not self.is_configured:
-            logger.warning("Discord webhook not configured, skipping notification")
-            return False
+        embed = self.build_embed(title, description, color, fields, footer)
+        return await self.send_embeds([embed], summary=title)
 
+    def build_embed(
+        self,
+        title: str,
+        description: str,
+        color: int = COLOR_INFO,
+        fields: Optional[List[Dict[str, Any]]] = None,
+        footer: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build a Discord embed dict."""
         embed = {
             "title": title,
             "description": description,
@@ -79,14 +90,37 @@ class NotificationService:
         if footer:
             embed["footer"] = {"text": footer}
 
-        payload = {"embeds": [embed]}
+        return embed
+
+    async def send_embeds(
+        self, embeds: List[Dict[str, Any]], summary: Optional[str] = None
+    ) -> bool:
+        """
+        Send several embeds, packing up to MAX_EMBEDS_PER_MESSAGE per webhook call.
+
+        Args:
+            embeds: Embed dicts (see build_embed)
+            summary: Short label used in logs
+
+        Returns:
+            True if every message was sent successfully
+        """
+        if not self.is_configured:
+            logger.warning("Discord webhook not configured, skipping notification")
+            return False
+
+        summary = summary or f"{len(embeds)} embed(s)"
 
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.post(self.webhook_url, json=payload, timeout=10)
-                response.raise_for_status()
-                logger.info(f"Discord notification sent: {title}")
-                return True
+                for i in range(0, len(embeds), self.MAX_EMBEDS_PER_MESSAGE):
+                    payload = {"embeds": embeds[i : i + self.MAX_EMBEDS_PER_MESSAGE]}
+                    response = await client.post(
+                        self.webhook_url, json=payload, timeout=10
+                    )
+                    response.raise_for_status()
+            logger.info(f"Discord notification sent: {summary}")
+            return True
         except Exception as e:
             logger.error(f"Failed to send Discord notification: {e}")
             return False
@@ -5,18 +5,60 @@ Handles communication with Docker registries (Docker Hub, private registries)
 to check if newer image versions are available.
 """
 
+import asyncio
+import hashlib
 import logging
+import re
+import time
 
 import base64
+from functools import lru_cache
 from typing import Optional, Tuple
 from dataclasses import dataclass
+from datetime import datetime
 
 import httpx
+from sqlalchemy import select
 
-logger = logging.getLogger(__name__)
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models.registry_cache import RegistryDigestCache
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Manifest media types we accept, joined once for the Accept header
+_MANIFEST_ACCEPT = ", ".join(
+    [
+        "application/vnd.docker.distribution.manifest.v2+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+        "application/vnd.oci.image.manifest.v1+json",
+        "application/vnd.oci.image.index.v1+json",
+    ]
+)
+
+# SSL contexts are expensive to build, so create them once per process.
+# Verification is only skipped for local registries and those listed in
+# INSECURE_REGISTRIES (self-signed private registries).
+_SSL_VERIFY = httpx.create_ssl_context()
+_SSL_NO_VERIFY = httpx.create_ssl_context(verify=False)
+_INSECURE_REGISTRIES = frozenset(
+    r.strip() for r in get_settings().insecure_registries.split(",") if r.strip()
+)
+
+# The first path component is a registry only if it looks like a hostname
+# (contains "." or ":") or is localhost
+_REGISTRY_PATTERN = r"[^/]*[.:][^/]*|localhost"
+
+# [registry/]repository[:tag][@digest]
+_IMAGE_RE = re.compile(
+    rf"^(?:(?P<registry>{_REGISTRY_PATTERN})/)?"
+    r"(?P<repository>[^:@]+)"
+    r"(?::(?P<tag>[^:@/]+))?"
+    r"(?:@.+)?$"
+)
+
+
+@dataclass(frozen=True)
 class ImageReference:
     """Parsed Docker image reference."""
 
@@ -31,6 +73,24 @@ class ImageReference:
         return f"{self.registry}/{self.repository}:{self.tag}"
 
 
+@lru_cache(maxsize=4096)
+def _parse_image_name_cached(image: str) -> ImageReference:
+    """Parse an image name in a single regex pass (memoized)."""
+    match = _IMAGE_RE.match(image)
+    if not match:
+        raise ValueError(f"Invalid image reference: {image}")
+
+    registry = match.group("registry") or "docker.io"
+    repository = match.group("repository")
+    tag = match.group("tag") or "latest"
+
+    # Official Docker Hub images live under library/
+    if registry == "docker.io" and "/" not in repository:
+        repository = f"library/{repository}"
+
+    return ImageReference(registry=registry, repository=repository, tag=tag)
+
+
 class RegistryService:
     """
     Service for interacting with Docker registries.
@@ -40,6 +100,34 @@ class RegistryService:
     DOCKER_HUB_AUTH = "https://auth.docker.io/token"
     DOCKER_HUB_REGISTRY = "https://registry-1.docker.io"
 
+    # Default token lifetime when the auth server omits expires_in (seconds)
+    DEFAULT_TOKEN_TTL = 300
+    # Refresh tokens this many seconds before they actually expire
+    TOKEN_EXPIRY_MARGIN = 30
+
+    # (username, repository) -> (token, monotonic expiry), shared by all
+    # instances since a new service is created per request
+    _tokens: dict[Tuple[Optional[str], str], Tuple[str, float]] = {}
+    _token_locks: dict[Tuple[Optional[str], str], asyncio.Lock] = {}
+
+    # How long a resolved digest is shared with identical lookups (seconds)
+    INFLIGHT_TTL = 60
+
+    # (username, image) -> digest future, shared by all instances since a
+    # new service is created per request
+    _inflight: dict[Tuple[Optional[str], str], asyncio.Future] = {}
+
+    # Consecutive lookup failures per image before logging at ERROR level
+    FAILURE_LOG_THRESHOLD = 3
+    _failures: dict[str, int] = {}
+
+    # Registries where HEAD is broken or lacks Docker-Content-Digest
+    _supports_head: dict[str, bool] = {}
+
+    # image -> (digest, etag), persisted in registry_digest_cache and loaded
+    # at startup by load_digest_cache()
+    _digest_cache: dict[str, Tuple[str, Optional[str]]] = {}
+
     def __init__(self, username: Optional[str] = None, password: Optional[str] = None):
         """
         Initialize registry service.
@@ -50,7 +138,12 @@ class RegistryService:
         """
         self.username = username
         self.password = password
-        self._tokens: dict[str, str] = {}
+
+        # Basic auth header for generic registries, encoded once
+        self._basic_auth: Optional[str] = None
+        if username and password:
+            credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+            self._basic_auth = f"Basic {credentials}"
 
     def parse_image_name(self, image: str) -> ImageReference:
         """
@@ -68,39 +161,7 @@ class RegistryService:
         Returns:
             ImageReference with registry, repository, tag
         """
-        # Default values
-        registry = "docker.io"
-        tag = "latest"
-
-        # Check if image contains a tag
-        if ":" in image and "@" not in image:
-            image, tag = image.rsplit(":", 1)
-
-        # Handle digest format (image@sha256:...)
-        if "@" in image:
-            image = image.split("@")[0]
-
-        # Check if first part is a registry
-        parts = image.split("/")
-
-        if len(parts) == 1:
-            # Simple name like "nginx"
-            repository = f"library/{parts[0]}"
-        elif len(parts) == 2:
-            # Could be registry/repo or user/repo
-            if "." in parts[0] or ":" in parts[0] or parts[0] == "localhost":
-                # It's a registry
-                registry = parts[0]
-                repository = parts[1]
-            else:
-                # It's user/repo on Docker Hub
-                repository = image
-        else:
-            # registry/namespace/repo format
-            registry = parts[0]
-            repository = "/".join(parts[1:])
-
-        return ImageReference(registry=registry, repository=repository, tag=tag)
+        return _parse_image_name_cached(image)
 
     async def get_docker_hub_token(self, repository: str) -> str:
         """
@@ -112,26 +173,46 @@ class RegistryService:
         Returns:
             Bearer token
         """
-        cache_key = f"docker.io/{repository}"
-        if cache_key in self._tokens:
-            return self._tokens[cache_key]
-
-        async with httpx.AsyncClient() as client:
-            params = {
-                "service": "registry.docker.io",
-                "scope": f"repository:{repository}:pull",
-            }
-
-            auth = None
-            if self.username and self.password:
-                auth = (self.username, self.password)
-
-            response = await client.get(self.DOCKER_HUB_AUTH, params=params, auth=auth)
-            response.raise_for_status()
+        cache_key = (self.username, repository)
+        cached = self._tokens.get(cache_key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        # Serialize fetches per repository so concurrent checks on a cold
+        # cache share a single auth request
+        lock = self._token_locks.setdefault(cache_key, asyncio.Lock())
+        async with lock:
+            cached = self._tokens.get(cache_key)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+
+            async with httpx.AsyncClient(verify=_SSL_VERIFY) as client:
+                params = {
+                    "service": "registry.docker.io",
+                    "scope": f"repository:{repository}:pull",
+                }
+
+                auth = None
+                if self.username and self.password:
+                    auth = (self.username, self.password)
+
+                response = await client.get(
+                    self.DOCKER_HUB_AUTH, params=params, auth=auth
+                )
+                response.raise_for_status()
+
+                data = response.json()
+                token = data["token"]
+                expires_in = data.get("expires_in") or self.DEFAULT_TOKEN_TTL
+                self._tokens[cache_key] = (
+                    token,
+                    time.monotonic() + expires_in - self.TOKEN_EXPIRY_MARGIN,
+                )
+                return token
 
-            token = response.json()["token"]
-            self._tokens[cache_key] = token
-            return token
+    def invalidate_docker_hub_token(self, repository: str):
+        """Drop a cached Docker Hub token (e.g. after a 401)."""
+        self._tokens.pop((self.username, repository), None)
 
     async def get_remote_digest(self, image: str) -> Optional[str]:
         """
@@ -143,38 +224,97 @@ class RegistryService:
         Returns:
             Image digest (sha256:...) or None if not found
         """
-        ref = self.parse_image_name(image)
+        try:
+            ref = self.parse_image_name(image)
+        except ValueError as e:
+            logger.warning(f"Failed to get remote digest for {image!r}: {e}")
+            return None
+
+        # Coalesce identical lookups: concurrent callers (e.g. the same image
+        # on many hosts) share one in-flight request and its result for a
+        # short while afterwards
+        key = (self.username, ref.full_name)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+
+        digest = None
+        try:
+            digest = await self._fetch_remote_digest(image, ref)
+        finally:
+            future.set_result(digest)
+            if digest is None:
+                # Don't keep failures around; let the next caller retry
+                self._inflight.pop(key, None)
+            else:
+                loop.call_later(self.INFLIGHT_TTL, self._inflight.pop, key, None)
 
+        return digest
+
+    async def _fetch_remote_digest(
+        self, image: str, ref: ImageReference
+    ) -> Optional[str]:
+        """Query the registry for the digest of a parsed image reference."""
         try:
             if ref.registry == "docker.io":
-                return await self._get_docker_hub_digest(ref)
+                digest = await self._get_docker_hub_digest(ref)
             else:
-                return await self._get_generic_registry_digest(ref)
-        except Exception as e:
-            logger.error(f"Failed to get remote digest for {image}: {e}")
+                digest = await self._get_generic_registry_digest(ref)
+        except httpx.HTTPError as e:
+            # Transient registry errors are expected; only shout once an image
+            # keeps failing
+            failures = self._failures.get(ref.full_name, 0) + 1
+            self._failures[ref.full_name] = failures
+            level = (
+                logging.ERROR
+                if failures >= self.FAILURE_LOG_THRESHOLD
+                else logging.DEBUG
+            )
+            logger.log(
+                level,
+                f"Failed to get remote digest for {image} "
+                f"({failures} consecutive): {e}",
+            )
             return None
 
+        self._failures.pop(ref.full_name, None)
+        return digest
+
     async def _get_docker_hub_digest(self, ref: ImageReference) -> Optional[str]:
         """Get digest from Docker Hub."""
         token = await self.get_docker_hub_token(ref.repository)
 
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(verify=_SSL_VERIFY) as client:
             # Request manifest with proper Accept header for digest
             headers = {
                 "Authorization": f"Bearer {token}",
-                "Accept": ", ".join(
-                    [
-                        "application/vnd.docker.distribution.manifest.v2+json",
-                        "application/vnd.docker.distribution.manifest.list.v2+json",
-                        "application/vnd.oci.image.manifest.v1+json",
-                        "application/vnd.oci.image.index.v1+json",
-                    ]
-                ),
+                "Accept": _MANIFEST_ACCEPT,
             }
 
             url = f"{self.DOCKER_HUB_REGISTRY}/v2/{ref.repository}/manifests/{ref.tag}"
+
+            # HEAD only: manifest GETs count against Docker Hub's pull rate
+            # limit. Make it conditional when the digest is already known.
+            known = self._digest_cache.get(ref.full_name)
+            if known:
+                headers["If-None-Match"] = known[1] or f'"{known[0]}"'
+
             response = await client.head(url, headers=headers)
 
+            if response.status_code == 401:
+                # Token expired or was revoked early - refetch once and retry
+                self.invalidate_docker_hub_token(ref.repository)
+                token = await self.get_docker_hub_token(ref.repository)
+                headers["Authorization"] = f"Bearer {token}"
+                response = await client.head(url, headers=headers)
+
+            if response.status_code == 304:
+                return known[0]
+
             if response.status_code == 404:
                 logger.warning(f"Image not found: {ref.full_name}")
                 return None
@@ -183,37 +323,79 @@ class RegistryService:
 
             # Digest is in the Docker-Content-Digest header
             digest = response.headers.get("Docker-Content-Digest")
+
+            if digest:
+                await self._remember_digest(
+                    ref.full_name, digest, response.headers.get("ETag")
+                )
+
             return digest
 
+    @classmethod
+    async def load_digest_cache(cls):
+        """Load persisted digests so the first check after a restart is conditional."""
+        async with async_session_maker() as session:
+            result = await session.execute(select(RegistryDigestCache))
+            cls._digest_cache = {
+                row.image: (row.digest, row.etag) for row in result.scalars()
+            }
+        logger.info(f"Loaded {len(cls._digest_cache)} cached registry digest(s)")
+
+    async def _remember_digest(self, image: str, digest: str, etag: Optional[str]):
+        """Record a digest in memory and persist it if it changed."""
+        existing = self._digest_cache.get(image)
+        if existing and existing[0] == digest:
+            # Keep a previously seen ETag when this response didn't send one
+            etag = etag or existing[1]
+            if existing[1] == etag:
+                return
+
+        self._digest_cache[image] = (digest, etag)
+        try:
+            async with async_session_maker() as session:
+                await session.merge(
+                    RegistryDigestCache(
+                        image=image,
+                        digest=digest,
+                        etag=etag,
+                        fetched_at=datetime.utcnow(),
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist digest for {image}: {e}")
+
     async def _get_generic_registry_digest(self, ref: ImageReference) -> Optional[str]:
         """Get digest from a generic OCI registry."""
         # Determine protocol (default to https)
         if ref.registry.startswith("localhost") or ref.registry.startswith("127."):
             base_url = f"http://{ref.registry}"
+            ssl_context = _SSL_NO_VERIFY
         else:
             base_url = f"https://{ref.registry}"
+            ssl_context = (
+                _SSL_NO_VERIFY if ref.registry in _INSECURE_REGISTRIES else _SSL_VERIFY
+            )
 
-        async with httpx.AsyncClient(verify=False) as client:
-            headers = {
-                "Accept": ", ".join(
-                    [
-                        "application/vnd.docker.distribution.manifest.v2+json",
-                        "application/vnd.docker.distribution.manifest.list.v2+json",
-                        "application/vnd.oci.image.manifest.v1+json",
-                        "application/vnd.oci.image.index.v1+json",
-                    ]
-                )
-            }
+        async with httpx.AsyncClient(verify=ssl_context) as client:
+            headers = {"Accept": _MANIFEST_ACCEPT}
 
             # Add basic auth if credentials provided
-            if self.username and self.password:
-                credentials = base64.b64encode(
-                    f"{self.username}:{self.password}".encode()
-                ).decode()
-                headers["Authorization"] = f"Basic {credentials}"
+            if self._basic_auth:
+                headers["Authorization"] = self._basic_auth
 
             url = f"{base_url}/v2/{ref.repository}/manifests/{ref.tag}"
-            response = await client.head(url, headers=headers)
+
+            # HEAD avoids transferring the manifest, unless this registry is
+            # known to reject it or to omit the digest header
+            use_head = self._supports_head.get(ref.registry, True)
+            if use_head:
+                response = await client.head(url, headers=headers)
+                if response.status_code == 405:
+                    self._supports_head[ref.registry] = False
+                    use_head = False
+            if not use_head:
+                response = await client.get(url, headers=headers)
 
             if response.status_code == 401:
                 # Try to handle WWW-Authenticate challenge
@@ -225,7 +407,31 @@ class RegistryService:
                 return None
 
             response.raise_for_status()
-            return response.headers.get("Docker-Content-Digest")
+
+            try:
+                digest = response.headers["docker-content-digest"]
+                await self._remember_digest(
+                    ref.full_name, digest, response.headers.get("ETag")
+                )
+                return digest
+            except KeyError:
+                pass
+
+            # Some registries (e.g. ECR) omit the header; fall back to GET and
+            # remember so later lookups skip the useless HEAD
+            if use_head:
+                self._supports_head[ref.registry] = False
+                response = await client.get(url, headers=headers)
+                response.raise_for_status()
+                digest = response.headers.get("docker-content-digest")
+                if digest:
+                    await self._remember_digest(ref.full_name, digest, None)
+                    return digest
+
+            # The digest of a manifest is the sha256 of its exact bytes
+            digest = f"sha256:{hashlib.sha256(response.content).hexdigest()}"
+            await self._remember_digest(ref.full_name, digest, None)
+            return digest
 
     async def check_update_available(
         self, image: str, local_digest: Optional[str]
@@ -2,7 +2,10 @@
 Background scheduler service for automatic update checks and application.
 """
 
+import asyncio
 import logging
+import re
+from dataclasses import dataclass
 from datetime import datetime
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -14,21 +17,48 @@ from app.database import async_session_maker
 from app.models.host import Host
 from app.services.docker_service import DockerService
 from app.services.ssh_service import SSHService
-from app.services.notification_service import send_discord_notification
+from app.services.notification_service import NotificationService
 from app.utils import decrypt_value
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Errors meaning the host has no usable Docker (SSH-only host)
+_DOCKER_MISSING_RE = re.compile(
+    r"docker: command not found|cannot access docker|docker daemon.*not running",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@dataclass
+class Notification:
+    """A queued Discord notification for a host."""
+
+    host_name: str
+    title: str
+    description: str
+    color: int
+
 
 class UpdateScheduler:
     """Manages automatic update checking and application."""
 
+    # Seconds stop() waits for queued notifications to be sent
+    NOTIFICATION_FLUSH_TIMEOUT = 10
+
+    # Hosts processed at once (SSH handshakes, upgrades, container recreates)
+    MAX_CONCURRENT_HOSTS = 10
+
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
         self.is_running = False
         self.last_run: datetime | None = None
         self.next_run: datetime | None = None
+        # host id -> notifications collected during the current pass
+        self._pending: dict[int, list[Notification]] = {}
+        # One batch per host per pass; None is the stop sentinel
+        self._notif_queue: asyncio.Queue[list[Notification] | None] = asyncio.Queue()
+        self._notif_task: asyncio.Task | None = None
 
     def start(self):
         """Start the scheduler."""
@@ -53,6 +83,7 @@ class UpdateScheduler:
             )
 
         self.scheduler.start()
+        self._notif_task = asyncio.create_task(self._notification_worker())
         self.is_running = True
 
         # Update next run time
@@ -62,13 +93,61 @@ class UpdateScheduler:
 
         logger.info(f"✅ Scheduler started. Next check: {self.next_run}")
 
-    def stop(self):
-        """Stop the scheduler."""
+    async def stop(self):
+        """Stop the scheduler, sending any notifications still queued."""
         if self.is_running:
             logger.info("🛑 Stopping auto-update scheduler")
             self.scheduler.shutdown()
+            if self._notif_task:
+                self._notif_queue.put_nowait(None)
+                try:
+                    await asyncio.wait_for(
+                        self._notif_task, timeout=self.NOTIFICATION_FLUSH_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("⚠️ Timed out sending queued notifications")
+                self._notif_task = None
             self.is_running = False
 
+    def _notify(self, host: Host, title: str, description: str, color: int):
+        """Collect a notification; it is sent with the rest of the host's batch."""
+        self._pending.setdefault(host.id, []).append(
+            Notification(
+                host_name=host.name, title=title, description=description, color=color
+            )
+        )
+
+    def _flush_notifications(self, host: Host):
+        """Queue everything collected for a host as one batch."""
+        batch = self._pending.pop(host.id, None)
+        if batch:
+            self._notif_queue.put_nowait(batch)
+
+    async def _notification_worker(self):
+        """
+        Send each queued host batch as one webhook message.
+
+        Returns once the stop sentinel (None) is dequeued; batches queued
+        before it have been sent by then.
+        """
+        service = NotificationService()
+
+        while True:
+            batch = await self._notif_queue.get()
+            if batch is None:
+                return
+
+            host_name = batch[0].host_name
+            embeds = [
+                service.build_embed(n.title, n.description, n.color) for n in batch
+            ]
+            try:
+                await service.send_embeds(
+                    embeds, summary=f"{len(embeds)} update(s) on {host_name}"
+                )
+            except Exception as e:
+                logger.error(f"Failed to send notifications for {host_name}: {e}")
+
     async def run_now(self):
         """Manually trigger an update check."""
         logger.info("▶️ Manual update check triggered")
@@ -83,19 +162,28 @@ class UpdateScheduler:
             logger.info(f"🔍 Starting automatic update check at {self.last_run}")
             logger.info("=" * 60)
 
-            # Get all hosts from database
-            async with async_session_maker() as session:
-                result = await session.execute(select(Host))
-                hosts = result.scalars().all()
+            # Stream hosts from the database, starting each check as its row
+            # arrives; the semaphore bounds how many run at once
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_HOSTS)
 
-                if not hosts:
-                    logger.info("ℹ️ No hosts configured")
-                    return
+            async def _bounded(host: Host):
+                async with semaphore:
+                    try:
+                        await self._process_host(host)
+                    finally:
+                        self._flush_notifications(host)
 
-                logger.info(f"📝 Found {len(hosts)} host(s) to check")
+            tasks = []
+            async with async_session_maker() as session:
+                async for host in await session.stream_scalars(select(Host)):
+                    tasks.append(asyncio.create_task(_bounded(host)))
+
+            if not tasks:
+                logger.info("ℹ️ No hosts configured")
+                return
 
-                for host in hosts:
-                    await self._process_host(host, session)
+            logger.info(f"📝 Checking {len(tasks)} host(s)")
+            await asyncio.gather(*tasks)
 
             logger.info("=" * 60)
             logger.info("✅ Automatic update check completed")
@@ -109,34 +197,58 @@ class UpdateScheduler:
         except Exception as e:
             logger.error(f"❌ Error during automatic update check: {e}", exc_info=True)
 
-    async def _process_host(self, host: Host, session):
+    async def _process_host(self, host: Host):
         """Process a single host for updates."""
         logger.info(f"\n📡 Checking host: {host.name} ({host.hostname})")
 
         try:
-            # Check containers if enabled
-            if settings.auto_update_containers:
-                await self._check_containers(host)
-            else:
-                logger.info(
-                    "  ⏭️ Container updates disabled (AUTO_UPDATE_CONTAINERS=false)"
-                )
+            # Decrypt credentials once for both container and system checks
+            ssh_key = (
+                decrypt_value(host.ssh_key_encrypted, settings.secret_key)
+                if host.ssh_key_encrypted
+                else None
+            )
+            ssh_password = (
+                decrypt_value(host.ssh_password_encrypted, settings.secret_key)
+                if host.ssh_password_encrypted
+                else None
+            )
 
-            # Check system updates if enabled
-            if settings.auto_update_system:
-                await self._check_system(host)
-            else:
-                logger.info("  ⏭️ System updates disabled (AUTO_UPDATE_SYSTEM=false)")
+            # One SSH connection per host, shared by container and system checks
+            docker_service = DockerService(
+                host=host,
+                ssh_key=ssh_key,
+                ssh_password=ssh_password,
+            )
+
+            try:
+                # Check containers if enabled
+                if settings.auto_update_containers:
+                    await self._check_containers(host, docker_service)
+                else:
+                    logger.info(
+                        "  ⏭️ Container updates disabled (AUTO_UPDATE_CONTAINERS=false)"
+                    )
+
+                # Check system updates if enabled
+                if settings.auto_update_system:
+                    ssh_service = SSHService(
+                        host=host,
+                        private_key=ssh_key,
+                        password=ssh_password,
+                        ssh_client=await docker_service.connect_ssh(),
+                    )
+                    await self._check_system(host, ssh_service)
+                else:
+                    logger.info(
+                        "  ⏭️ System updates disabled (AUTO_UPDATE_SYSTEM=false)"
+                    )
+            finally:
+                await docker_service.disconnect()
 
         except Exception as e:
             # Check if error is due to Docker being unavailable (SSH-only host)
-            error_str = str(e).lower()
-            is_docker_missing = (
-                "docker: command not found" in error_str
-                or "cannot access docker" in error_str
-                or "docker daemon" in error_str
-                and "not running" in error_str
-            )
+            is_docker_missing = bool(_DOCKER_MISSING_RE.search(str(e)))
 
             if is_docker_missing:
                 logger.warning(
@@ -144,36 +256,18 @@ class UpdateScheduler:
                 )
             else:
                 logger.error(f"  ❌ Error processing host {host.name}: {e}")
-                await send_discord_notification(
+                self._notify(
+                    host,
                     f"❌ Auto-update failed for **{host.name}**",
                     f"```{str(e)}```",
                     color=0xFF0000,
                 )
 
-    async def _check_containers(self, host: Host):
+    async def _check_containers(self, host: Host, docker_service: DockerService):
         """Check and update containers for a host."""
         logger.info("  🐳 Checking containers...")
 
         try:
-            # Decrypt credentials
-            ssh_key = (
-                decrypt_value(host.ssh_key_encrypted, settings.secret_key)
-                if host.ssh_key_encrypted
-                else None
-            )
-            ssh_password = (
-                decrypt_value(host.ssh_password_encrypted, settings.secret_key)
-                if host.ssh_password_encrypted
-                else None
-            )
-
-            # Connect to Docker
-            docker_service = DockerService(
-                host=host,
-                ssh_key=ssh_key,
-                ssh_password=ssh_password,
-            )
-
             # List containers with update check
             containers = await docker_service.list_containers(all=True)
 
@@ -188,27 +282,41 @@ class UpdateScheduler:
                 f"  🔄 Found {len(updates_available)} container(s) with updates"
             )
 
-            # Update each container
+            # Phase 1: pull all new images in parallel
+            pull_errors = await docker_service.pull_images_parallel(
+                [c.image for c in updates_available]
+            )
+
+            # Phase 2: recreate containers one at a time
             for container in updates_available:
                 container_name = container.name or container.id
                 logger.info(f"    📦 Updating: {container_name}")
 
                 try:
-                    result = await docker_service.update_container(container.id)
+                    pull_error = pull_errors.get(container.image)
+                    if pull_error:
+                        success, error_msg = False, f"Pull failed: {pull_error}"
+                    else:
+                        result = await docker_service.update_container(
+                            container.id, pull=False
+                        )
+                        success, error_msg = result.success, result.error
 
-                    if result.get("success"):
+                    if success:
                         logger.info(f"    ✅ {container_name} updated successfully")
-                        await send_discord_notification(
+                        self._notify(
+                            host,
                             f"✅ Container updated on **{host.name}**",
                             f"**{container_name}** has been updated to the latest version",
                             color=0x00FF00,
                         )
                     else:
-                        error_msg = result.get("error", "Unknown error")
+                        error_msg = error_msg or "Unknown error"
                         logger.error(
                             f"    ❌ {container_name} update failed: {error_msg}"
                         )
-                        await send_discord_notification(
+                        self._notify(
+                            host,
                             f"❌ Container update failed on **{host.name}**",
                             f"**{container_name}**: {error_msg}",
                             color=0xFF0000,
@@ -221,62 +329,39 @@ class UpdateScheduler:
             logger.error(f"  ❌ Docker check failed: {e}")
             raise
 
-    async def _check_system(self, host: Host):
+    async def _check_system(self, host: Host, ssh_service: SSHService):
         """Check and update system packages for a host."""
         logger.info("  💻 Checking system updates...")
 
         try:
-            # Decrypt credentials
-            ssh_key = (
-                decrypt_value(host.ssh_key_encrypted, settings.secret_key)
-                if host.ssh_key_encrypted
-                else None
-            )
-            ssh_password = (
-                decrypt_value(host.ssh_password_encrypted, settings.secret_key)
-                if host.ssh_password_encrypted
-                else None
-            )
-
-            # Connect via SSH
-            ssh_service = SSHService(
-                host=host,
-                private_key=ssh_key,
-                password=ssh_password,
-            )
-
-            await ssh_service.connect()
+            # Check for updates
+            updates = await ssh_service.check_updates()
 
-            try:
-                # Check for updates
-                updates = await ssh_service.check_updates()
-
-                if len(updates) == 0:
-                    logger.info("  ✅ System is up to date")
-                    return
-
-                logger.info(f"  🔄 Found {len(updates)} system update(s)")
+            if len(updates) == 0:
+                logger.info("  ✅ System is up to date")
+                return
 
-                # Apply updates
-                success, output = await ssh_service.apply_updates()
+            logger.info(f"  🔄 Found {len(updates)} system update(s)")
 
-                if success:
-                    logger.info("  ✅ System updates applied successfully")
-                    await send_discord_notification(
-                        f"✅ System updated on **{host.name}**",
-                        f"{len(updates)} package(s) updated",
-                        color=0x00FF00,
-                    )
-                else:
-                    logger.error("  ❌ System update failed")
-                    await send_discord_notification(
-                        f"❌ System update failed on **{host.name}**",
-                        "Check logs for details",
-                        color=0xFF0000,
-                    )
+            # Apply updates
+            success, output = await ssh_service.apply_updates()
 
-            finally:
-                await ssh_service.disconnect()
+            if success:
+                logger.info("  ✅ System updates applied successfully")
+                self._notify(
+                    host,
+                    f"✅ System updated on **{host.name}**",
+                    f"{len(updates)} package(s) updated",
+                    color=0x00FF00,
+                )
+            else:
+                logger.error("  ❌ System update failed")
+                self._notify(
+                    host,
+                    f"❌ System update failed on **{host.name}**",
+                    "Check logs for details",
+                    color=0xFF0000,
+                )
 
         except Exception as e:
             logger.error(f"  ❌ System check failed: {e}")
@@ -0,0 +1,214 @@
+"""
+SSH Connection Pool - Reuse asyncssh connections across SSHService instances.
+
+Routers create a new SSHService per request, so without pooling every API
+call pays a full TCP handshake, key exchange and authentication.
+"""
+
+import asyncio
+import hashlib
+import logging
+import secrets
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from asyncssh import SFTPClient, SSHClientConnection
+
+from app.models.host import Host
+
+logger = logging.getLogger(__name__)
+
+# (hostname, port, user, credential fingerprint)
+PoolKey = Tuple[str, int, Optional[str], str]
+
+# Keys the credential fingerprints; random per process so pool keys are
+# useless outside it
+_FINGERPRINT_KEY = secrets.token_bytes(32)
+
+
+def is_connection_alive(conn: SSHClientConnection) -> bool:
+    """
+    Check whether an SSH connection can still be used.
+
+    Connections are opened with keepalives, so asyncssh closes dead ones
+    itself and this only has to ask whether that has happened. asyncssh
+    drops the transport when it closes, and SSHClientConnection.is_closed()
+    is not available until 2.15, so check the transport directly.
+    """
+    transport = conn._transport
+    return transport is not None and not transport.is_closing()
+
+
+class SSHConnectionPool:
+    """
+    Pool of idle SSH connections, keyed by host and credentials.
+    """
+
+    def __init__(self, max_idle_per_host: int = 4, idle_ttl: float = 300):
+        """
+        Initialize the pool.
+
+        Args:
+            max_idle_per_host: Idle connections kept per key; extras are closed
+            idle_ttl: Seconds a connection may sit idle before it is closed
+        """
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_ttl = idle_ttl
+        # key -> [(connection, monotonic time it went idle)], newest last
+        self._idle: Dict[PoolKey, List[Tuple[SSHClientConnection, float]]] = {}
+        # Timer for the next idle sweep, armed while anything is idle
+        self._sweep_handle: Optional[asyncio.TimerHandle] = None
+        # connection -> its SFTP session (starting or started), closed with it
+        self._sftp: Dict[SSHClientConnection, asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(
+        host: Host, private_key: Optional[str] = None, password: Optional[str] = None
+    ) -> PoolKey:
+        """Build the pool key for a host, without keeping the raw secret."""
+        secret = private_key or password or ""
+        fingerprint = hashlib.blake2b(
+            secret.encode(), key=_FINGERPRINT_KEY, digest_size=16
+        ).hexdigest()
+        return (host.hostname, host.ssh_port, host.ssh_user, fingerprint)
+
+    async def acquire(
+        self,
+        key: PoolKey,
+        connect: Callable[[], Awaitable[SSHClientConnection]],
+    ) -> SSHClientConnection:
+        """
+        Borrow an idle connection, or open a new one with connect().
+
+        Args:
+            key: Pool key from make_key()
+            connect: Coroutine factory opening a fresh connection
+
+        Returns:
+            Live SSH connection
+        """
+        self._evict_expired()
+
+        idle = self._idle.get(key)
+        while idle:
+            # LIFO: the most recently used connection is the least likely
+            # to have been dropped by the server
+            conn, _ = idle.pop()
+            if is_connection_alive(conn):
+                return conn
+            self._close(conn)
+
+        return await connect()
+
+    def release(self, key: PoolKey, conn: SSHClientConnection):
+        """Return a borrowed connection to the pool."""
+        self._evict_expired()
+
+        if not is_connection_alive(conn):
+            self._close(conn)
+            return
+
+        idle = self._idle.setdefault(key, [])
+        if len(idle) >= self.max_idle_per_host:
+            self._close(conn)
+            return
+        idle.append((conn, time.monotonic()))
+        self._schedule_sweep()
+
+    def _schedule_sweep(self):
+        """Arm a timer for when the oldest idle connection expires."""
+        if self._sweep_handle is not None or not self._idle:
+            return
+
+        oldest = min(since for idle in self._idle.values() for _, since in idle)
+        delay = max(0.0, oldest + self.idle_ttl - time.monotonic())
+        self._sweep_handle = asyncio.get_running_loop().call_later(delay, self._sweep)
+
+    def _sweep(self):
+        """Timer callback: evict expired connections, then re-arm."""
+        self._sweep_handle = None
+        self._evict_expired()
+        self._schedule_sweep()
+
+    def _evict_expired(self):
+        """
+        Close connections idle for longer than idle_ttl.
+
+        Sweeps every key, so connections left under a key that is never
+        used again (e.g. the host's address or credentials changed) go too.
+        """
+        cutoff = time.monotonic() - self.idle_ttl
+        for key in list(self._idle):
+            idle = self._idle[key]
+            fresh = [(conn, since) for conn, since in idle if since > cutoff]
+            for conn, since in idle:
+                if since <= cutoff:
+                    self._close(conn)
+            if fresh:
+                self._idle[key] = fresh
+            else:
+                del self._idle[key]
+
+    async def sftp_client(self, conn: SSHClientConnection) -> SFTPClient:
+        """
+        Get the SFTP session kept with a pooled connection.
+
+        The session is started on first use, shared by concurrent callers and
+        closed when the pool closes the connection.
+
+        Args:
+            conn: Connection borrowed from this pool
+
+        Returns:
+            SFTP client
+        """
+        session = self._sftp.get(conn)
+        if session is None:
+            session = asyncio.ensure_future(conn.start_sftp_client())
+            self._sftp[conn] = session
+
+        try:
+            return await asyncio.shield(session)
+        except Exception:
+            if self._sftp.get(conn) is session:
+                del self._sftp[conn]
+            raise
+
+    def drop_sftp(self, conn: SSHClientConnection):
+        """Close a connection's SFTP session (e.g. after it failed)."""
+        session = self._sftp.pop(conn, None)
+        if session is None:
+            return
+        if not session.done():
+            session.cancel()
+        elif not session.cancelled() and session.exception() is None:
+            session.result().exit()
+
+    def _close(self, conn: SSHClientConnection):
+        """Close a connection along with its SFTP session."""
+        self.drop_sftp(conn)
+        conn.close()
+
+    async def close_all(self):
+        """Close every idle connection."""
+        if self._sweep_handle is not None:
+            self._sweep_handle.cancel()
+            self._sweep_handle = None
+        for idle in self._idle.values():
+            for conn, _ in idle:
+                self._close(conn)
+                try:
+                    await conn.wait_closed()
+                except Exception:
+                    pass
+        self._idle.clear()
+        logger.info("SSH connection pool closed")
+
+
+# Global pool instance
+ssh_pool = SSHConnectionPool()
+
+
+def get_ssh_pool() -> SSHConnectionPool:
+    """Get the global SSH connection pool."""
+    return ssh_pool
@@ -8,19 +8,107 @@ Handles SSH connections for:
 
 import logging
 import asyncio
-from typing import Optional, List, Tuple
+import hashlib
+import re
+import secrets
+import shlex
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Optional, List, Tuple, Dict, Union
 from dataclasses import dataclass
 
 
 import asyncssh
-from asyncssh import SSHClientConnection, SSHCompletedProcess
+from asyncssh import SSHClientConnection, SSHCompletedProcess, SSHKey
 
+from app.config import get_settings
 from app.models.host import Host
+from app.services.ssh_pool import (
+    PoolKey,
+    SSHConnectionPool,
+    is_connection_alive,
+    ssh_pool,
+)
 
 logger = logging.getLogger(__name__)
 
+# Keys the PEM fingerprints below; random per process so cache keys are
+# useless outside it
+_FINGERPRINT_KEY = secrets.token_bytes(32)
+
+# PEM fingerprint -> parsed key, shared by every SSHService, least recently
+# used first
+_imported_keys: "OrderedDict[bytes, SSHKey]" = OrderedDict()
+IMPORTED_KEY_CACHE_SIZE = 64
+
+
+def _import_private_key_cached(pem: str) -> SSHKey:
+    """Parse an SSH private key once per distinct PEM."""
+    fingerprint = hashlib.blake2b(
+        pem.encode(), key=_FINGERPRINT_KEY, digest_size=16
+    ).digest()
+
+    key = _imported_keys.get(fingerprint)
+    if key is not None:
+        _imported_keys.move_to_end(fingerprint)
+        return key
+
+    key = asyncssh.import_private_key(pem)
+    _imported_keys[fingerprint] = key
+    if len(_imported_keys) > IMPORTED_KEY_CACHE_SIZE:
+        _imported_keys.popitem(last=False)
+    return key
+
+
+# Supported distributions, by package manager
+APT_OS_IDS = ("debian", "ubuntu", "linuxmint")
+YUM_OS_IDS = ("centos", "rhel", "fedora", "rocky", "almalinux")
+APK_OS_IDS = ("alpine",)
+
+# Output sections of _PROBE_SCRIPT start with "###NAME" lines
+_SECTION_MARKER = b"###"
+
+# Detect the OS, refresh the package index and list upgradable packages in a
+# single exec (one channel open instead of three). The index is only refreshed
+# when REFRESH_INDEX=1 is set.
+_PROBE_SCRIPT = f"""
+echo '###OS'; cat /etc/os-release
+echo '###UPGRADABLE'
+. /etc/os-release
+case "$ID" in
+  {"|".join(APT_OS_IDS)})
+    [ "$REFRESH_INDEX" = 1 ] && sudo apt-get update -qq >/dev/null 2>&1
+    apt list --upgradable 2>/dev/null | tail -n +2 ;;
+  {"|".join(YUM_OS_IDS)})
+    yum check-update --quiet 2>/dev/null || true ;;
+  {"|".join(APK_OS_IDS)})
+    [ "$REFRESH_INDEX" = 1 ] && sudo apk update >/dev/null 2>&1
+    apk version -l '<' ;;
+esac
+"""
 
-@dataclass
+# Package manager output, one match per upgradable package. Matched against
+# raw bytes so only the captured fields get decoded.
+# package/repo version arch [upgradable from: old_version]
+_APT_RE = re.compile(
+    rb"^(?P<name>[^/\s]+)(?:/(?P<repository>[^/\s]*)\S*)?[ \t]+(?P<new_version>\S+)"
+    rb"(?:[^\n\[]*\[upgradable from:\s*(?P<current_version>[^\]\n]*?)\s*\])?",
+    re.MULTILINE,
+)
+# name.arch version repo (continuation and "Obsoleting" lines are skipped)
+_YUM_RE = re.compile(
+    rb"^(?!Obsoleting)(?P<name>\S+?)(?:\.[^.\s]*)?[ \t]+(?P<new_version>\S+)"
+    rb"(?:[ \t]+(?P<repository>\S+))?",
+    re.MULTILINE,
+)
+# name-version-release < new_version
+_APK_RE = re.compile(
+    rb"^(?P<name>\S+)-(?P<current_version>[^-\s]+)-[^-\s]+\s*<\s*(?P<new_version>\S+)",
+    re.MULTILINE,
+)
+
+
+@dataclass(slots=True)
 class PackageUpdate:
     """Represents an available package update."""
 
@@ -30,7 +118,7 @@ class PackageUpdate:
     repository: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemInfo:
     """System information gathered from host."""
 
@@ -45,11 +133,20 @@ class SSHService:
     Service for SSH-based operations on remote hosts.
     """
 
+    # host id -> monotonic time of the last package index refresh
+    _index_refresh_ts: Dict[int, float] = {}
+
+    # pool key -> (monotonic expiry, SystemInfo); the OS rarely changes, and
+    # apply_updates() drops the entry since a kernel update changes uname -r
+    SYSINFO_CACHE_TTL = 24 * 60 * 60
+    _sysinfo_cache: Dict[PoolKey, Tuple[float, SystemInfo]] = {}
+
     def __init__(
         self,
         host: Host,
         private_key: Optional[str] = None,
         password: Optional[str] = None,
+        ssh_client=None,
     ):
         """
         Initialize SSH service for a host.
@@ -58,64 +155,70 @@ class SSHService:
             host: Host model with connection details
             private_key: Decrypted SSH private key content
             password: SSH password (if not using key)
+            ssh_client: Already-connected paramiko client (e.g. from
+                DockerService.connect_ssh()) to run commands over instead of
+                opening a new connection. Owned by the caller.
         """
         self.host = host
         self.private_key = private_key
         self.password = password
         self._conn: Optional[SSHClientConnection] = None
+        self._shared_client = ssh_client
+        self._pool_key = SSHConnectionPool.make_key(host, private_key, password)
 
     async def connect(self) -> SSHClientConnection:
         """
         Establish SSH connection to the host.
 
+        Connections are borrowed from the process-wide pool and handed back
+        by disconnect().
+
         Returns:
             SSH connection
         """
         # Check if we have an active connection
         if self._conn is not None:
-            try:
-                # Test if connection is still alive
-                if (
-                    not getattr(self._conn, "_transport", None)
-                    or self._conn._transport.is_closing()
-                ):
-                    self._conn = None
-                else:
-                    return self._conn
-            except Exception:
-                self._conn = None
+            if is_connection_alive(self._conn):
+                return self._conn
+            # Let the pool close it along with its SFTP session
+            ssh_pool.release(self._pool_key, self._conn)
+            self._conn = None
+
+        self._conn = await ssh_pool.acquire(self._pool_key, self._open_connection)
+        return self._conn
 
+    async def _open_connection(self) -> SSHClientConnection:
+        """Open a new SSH connection to the host."""
         try:
             connect_kwargs = {
                 "host": self.host.hostname,
                 "port": self.host.ssh_port,
                 "username": self.host.ssh_user,
                 "known_hosts": None,  # Disable host key checking
+                # Let asyncssh detect connections dropped while pooled
+                "keepalive_interval": 30,
+                "keepalive_count_max": 3,
             }
 
             if self.private_key:
                 # Load key from string
-                key = asyncssh.import_private_key(self.private_key)
+                key = _import_private_key_cached(self.private_key)
                 connect_kwargs["client_keys"] = [key]
             elif self.password:
                 connect_kwargs["password"] = self.password
 
-            self._conn = await asyncssh.connect(**connect_kwargs)
+            conn = await asyncssh.connect(**connect_kwargs)
             logger.info(f"SSH connected to {self.host.name}")
-            return self._conn
+            return conn
 
         except Exception as e:
             logger.error(f"SSH connection failed to {self.host.name}: {e}")
             raise
 
     async def disconnect(self):
-        """Close SSH connection."""
+        """Return the SSH connection to the pool."""
         if self._conn:
-            self._conn.close()
-            try:
-                await self._conn.wait_closed()
-            except Exception:
-                pass
+            ssh_pool.release(self._pool_key, self._conn)
             self._conn = None
 
     async def run_command(
@@ -132,39 +235,179 @@ class SSHService:
         Returns:
             Tuple of (exit_code, stdout, stderr)
         """
-        conn = await self.connect()
-
         if sudo:
             command = f"sudo {command}"
 
+        if self._shared_client is not None:
+            return await asyncio.to_thread(self._run_on_shared_client, command, timeout)
+
+        conn = await self.connect()
+
         try:
-            result: SSHCompletedProcess = await asyncio.wait_for(
-                conn.run(command, check=False), timeout=timeout
+            result: SSHCompletedProcess = await conn.run(
+                command, check=False, timeout=timeout
             )
             return result.returncode or 0, result.stdout or "", result.stderr or ""
-        except asyncio.TimeoutError:
+        except asyncssh.TimeoutError:
             logger.error(f"Command timed out: {command}")
             return -1, "", "Command timed out"
 
-    async def get_system_info(self) -> SystemInfo:
+    async def _stream_lines(
+        self,
+        command: str,
+        sudo: bool = False,
+        timeout: int = 300,
+        encoding: Optional[str] = "utf-8",
+    ) -> AsyncIterator[Union[str, bytes]]:
+        """
+        Execute a command and yield its stdout line by line as it arrives.
+
+        Args:
+            command: Command to execute
+            sudo: Whether to run with sudo
+            timeout: Command timeout in seconds
+            encoding: Output encoding, or None for raw bytes lines
+
+        Yields:
+            Output lines, without the trailing newline
+        """
+        if self._shared_client is not None:
+            # The paramiko client is driven from a thread; no streaming there
+            _, stdout, _ = await self.run_command(command, sudo=sudo, timeout=timeout)
+            for line in stdout.splitlines():
+                yield line if encoding else line.encode()
+            return
+
+        if sudo:
+            command = f"sudo {command}"
+
+        conn = await self.connect()
+
+        try:
+            async with asyncio.timeout(timeout):
+                async with conn.create_process(
+                    command, stderr=asyncssh.DEVNULL, encoding=encoding
+                ) as process:
+                    async for line in process.stdout:
+                        yield line.rstrip(b"\n" if encoding is None else "\n")
+        except TimeoutError:
+            logger.error(f"Command timed out: {command}")
+
+    async def _read_file(self, path: str) -> str:
+        """
+        Read a small text file from the remote host.
+
+        Uses the SFTP session kept with the pooled connection, so after the
+        first read no channel setup or remote process is needed. Falls back
+        to `cat` when SFTP is unavailable.
+
+        Args:
+            path: Remote file path
+
+        Returns:
+            File content, or an empty string if it can't be read
+        """
+        if self._shared_client is None:
+            conn = await self.connect()
+            try:
+                sftp = await ssh_pool.sftp_client(conn)
+                async with sftp.open(path) as f:
+                    return await f.read()
+            except asyncssh.SFTPNoSuchFile:
+                return ""
+            except (asyncssh.Error, OSError) as e:
+                ssh_pool.drop_sftp(conn)
+                logger.debug(f"SFTP read of {path} failed on {self.host.name}: {e}")
+
+        _, stdout, _ = await self.run_command(f"cat {shlex.quote(path)}")
+        return stdout
+
+    def _run_on_shared_client(self, command: str, timeout: int) -> Tuple[int, str, str]:
+        """
+        Execute a command over the shared paramiko client (blocking).
+
+        stdout and stderr are drained while waiting, so a large output can't
+        fill the channel window and stall the command, and the whole call is
+        bounded by timeout.
+        """
+        channel = self._shared_client.get_transport().open_session()
+        deadline = time.monotonic() + timeout
+        stdout: List[bytes] = []
+        stderr: List[bytes] = []
+
+        try:
+            channel.exec_command(command)
+            while True:
+                while channel.recv_ready():
+                    stdout.append(channel.recv(32768))
+                while channel.recv_stderr_ready():
+                    stderr.append(channel.recv_stderr(32768))
+
+                if (
+                    channel.exit_status_ready()
+                    and not channel.recv_ready()
+                    and not channel.recv_stderr_ready()
+                ):
+                    break
+
+                if time.monotonic() >= deadline:
+                    logger.error(f"Command timed out: {command}")
+                    return -1, "", "Command timed out"
+
+                time.sleep(0.05)
+
+            return (
+                channel.recv_exit_status(),
+                b"".join(stdout).decode(errors="replace"),
+                b"".join(stderr).decode(errors="replace"),
+            )
+        finally:
+            channel.close()
+
+    async def get_system_info(self, use_cache: bool = True) -> SystemInfo:
         """
         Get operating system information.
 
+        Results are cached for SYSINFO_CACHE_TTL seconds per connection
+        target (address, user and credentials), so editing a host starts
+        afresh.
+
+        Args:
+            use_cache: Whether a cached result may be returned. Pass False
+                when the call doubles as a connectivity check.
+
         Returns:
             SystemInfo object
         """
-        # Get OS release info
-        code, stdout, _ = await self.run_command("cat /etc/os-release")
+        cached = self._sysinfo_cache.get(self._pool_key)
+        if use_cache and cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        if self._shared_client is None:
+            # Open the connection up front so both lookups share it
+            await self.connect()
+
+        # OS release info (over SFTP, no remote process) and kernel version
+        os_release, (_, kernel, _) = await asyncio.gather(
+            self._read_file("/etc/os-release"), self.run_command("uname -r")
+        )
+
+        sys_info = self._parse_system_info(os_release, kernel)
+        if sys_info.os_id != "unknown":
+            self._sysinfo_cache[self._pool_key] = (
+                time.monotonic() + self.SYSINFO_CACHE_TTL,
+                sys_info,
+            )
+        return sys_info
 
+    def _parse_system_info(self, os_release: str, kernel: str) -> SystemInfo:
+        """Build SystemInfo from /etc/os-release content and `uname -r`."""
         os_info = {}
-        for line in stdout.strip().split("\n"):
+        for line in os_release.strip().split("\n"):
             if "=" in line:
                 key, value = line.split("=", 1)
                 os_info[key] = value.strip('"')
 
-        # Get kernel version
-        code, kernel, _ = await self.run_command("uname -r")
-
         return SystemInfo(
             os_id=os_info.get("ID", "unknown"),
             os_version=os_info.get("VERSION_ID", "unknown"),
@@ -176,116 +419,145 @@ class SSHService:
         """
         Check for available system updates.
 
+        OS detection, the package index refresh and the upgradable listing
+        all run in a single remote command. The index refresh is skipped if
+        it already ran within the configured package_index_ttl_seconds.
+
         Returns:
             List of available package updates
         """
-        sys_info = await self.get_system_info()
-
-        if sys_info.os_id in ("debian", "ubuntu", "linuxmint"):
-            return await self._check_apt_updates()
-        elif sys_info.os_id in ("centos", "rhel", "fedora", "rocky", "almalinux"):
-            return await self._check_yum_updates()
-        elif sys_info.os_id == "alpine":
-            return await self._check_apk_updates()
-        else:
-            logger.warning(f"Unsupported OS for update check: {sys_info.os_id}")
-            return []
-
-    async def _check_apt_updates(self) -> List[PackageUpdate]:
-        """Check for updates on Debian/Ubuntu systems."""
-        # First update package lists
-        await self.run_command("apt-get update", sudo=True, timeout=120)
-
-        # Get upgradable packages
-        code, stdout, _ = await self.run_command(
-            "apt list --upgradable 2>/dev/null | tail -n +2"
+        last_refresh = self._index_refresh_ts.get(self.host.id)
+        refresh = (
+            last_refresh is None
+            or time.monotonic() - last_refresh
+            >= get_settings().package_index_ttl_seconds
         )
 
-        updates = []
-        for line in stdout.strip().split("\n"):
-            if not line:
-                continue
-            # Format: package/repo version arch [upgradable from: old_version]
-            try:
-                parts = line.split()
-                name_repo = parts[0]
-                name = name_repo.split("/")[0]
-                new_version = parts[1]
-
-                # Extract old version from [upgradable from: x.x.x]
-                old_version = "unknown"
-                if "upgradable from:" in line:
-                    old_version = line.split("upgradable from:")[1].strip().rstrip("]")
-
-                updates.append(
-                    PackageUpdate(
-                        name=name,
-                        current_version=old_version,
-                        new_version=new_version,
-                        repository=name_repo.split("/")[1]
-                        if "/" in name_repo
-                        else None,
-                    )
-                )
-            except (IndexError, ValueError):
-                logger.warning(f"Failed to parse apt update line: {line}")
-                continue
+        command = f"REFRESH_INDEX={int(refresh)} sh -c {shlex.quote(_PROBE_SCRIPT)}"
+
+        # Parse the upgradable listing as it streams in; only the small OS
+        # section is buffered
+        os_release: List[str] = []
+        section = None
+        parse_line = None
+        updates: List[PackageUpdate] = []
+        skipped = 0
+
+        async for line in self._stream_lines(command, timeout=180, encoding=None):
+            if line.startswith(_SECTION_MARKER):
+                section = line[len(_SECTION_MARKER) :].strip().decode()
+                if section == "UPGRADABLE":
+                    # The OS section always comes first
+                    os_id = self._parse_system_info("\n".join(os_release), "").os_id
+                    parse_line = self._line_parser(os_id)
+                    if parse_line is None:
+                        logger.warning(f"Unsupported OS for update check: {os_id}")
+                    if refresh:
+                        self._index_refresh_ts[self.host.id] = time.monotonic()
+            elif section == "OS":
+                os_release.append(line.decode(errors="replace"))
+            elif section == "UPGRADABLE" and parse_line is not None:
+                update = parse_line(line)
+                if update is not None:
+                    updates.append(update)
+                elif line:
+                    skipped += 1
+
+        # yum and apk listings have header lines that are expected not to
+        # match; every line of the apt listing should
+        if skipped and os_id in APT_OS_IDS:
+            logger.warning(
+                f"Skipped {skipped} unparseable apt update lines on {self.host.name}"
+            )
 
         return updates
 
-    async def _check_yum_updates(self) -> List[PackageUpdate]:
-        """Check for updates on RHEL/CentOS systems."""
-        code, stdout, _ = await self.run_command(
-            "yum check-update --quiet 2>/dev/null || true"
-        )
+    @classmethod
+    async def check_updates_many(
+        cls,
+        hosts: List[Tuple[Host, Optional[str], Optional[str]]],
+        concurrency: int = 10,
+    ) -> Dict[int, Union[List[PackageUpdate], Exception]]:
+        """
+        Check for system updates on several hosts concurrently.
 
-        updates = []
-        for line in stdout.strip().split("\n"):
-            if not line or line.startswith("Obsoleting"):
-                continue
-            parts = line.split()
-            if len(parts) >= 2:
+        Args:
+            hosts: (host, private_key, password) for each host to check
+            concurrency: Hosts checked at once. sshd's MaxStartups applies per
+                target, so this bounds our own connection fan-out rather than
+                any single server's load.
+
+        Returns:
+            Dict of host id to its updates, or the exception the check raised
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _check(
+            host: Host, private_key: Optional[str], password: Optional[str]
+        ) -> List[PackageUpdate]:
+            async with semaphore:
+                service = cls(host, private_key, password)
                 try:
-                    name = parts[0].rsplit(".", 1)[0]  # Remove arch
-                    new_version = parts[1]
-                    updates.append(
-                        PackageUpdate(
-                            name=name,
-                            current_version="installed",
-                            new_version=new_version,
-                            repository=parts[2] if len(parts) > 2 else None,
-                        )
-                    )
-                except (IndexError, ValueError):
-                    continue
+                    return await service.check_updates()
+                finally:
+                    await service.disconnect()
 
-        return updates
+        results = await asyncio.gather(
+            *(_check(*entry) for entry in hosts), return_exceptions=True
+        )
+        return {entry[0].id: result for entry, result in zip(hosts, results)}
+
+    def _line_parser(
+        self, os_id: str
+    ) -> Optional[Callable[[bytes], Optional[PackageUpdate]]]:
+        """Pick the upgradable-listing line parser for an OS, if supported."""
+        if os_id in APT_OS_IDS:
+            return self._parse_apt_line
+        elif os_id in YUM_OS_IDS:
+            return self._parse_yum_line
+        elif os_id in APK_OS_IDS:
+            return self._parse_apk_line
+        return None
+
+    @staticmethod
+    def _parse_apt_line(line: bytes) -> Optional[PackageUpdate]:
+        """Parse a line of `apt list --upgradable` output."""
+        m = _APT_RE.match(line)
+        if m is None:
+            return None
+        current, repository = m["current_version"], m["repository"]
+        return PackageUpdate(
+            name=m["name"].decode(),
+            current_version=current.decode() if current else "unknown",
+            new_version=m["new_version"].decode(),
+            repository=repository.decode() if repository is not None else None,
+        )
 
-    async def _check_apk_updates(self) -> List[PackageUpdate]:
-        """Check for updates on Alpine systems."""
-        await self.run_command("apk update", sudo=True, timeout=60)
-
-        code, stdout, _ = await self.run_command("apk version -l '<'")
-
-        updates = []
-        for line in stdout.strip().split("\n"):
-            if not line or line.startswith("Installed:"):
-                continue
-            # Format: package-version < new-version
-            parts = line.split("<")
-            if len(parts) == 2:
-                name_version = parts[0].strip()
-                new_version = parts[1].strip()
-                # Extract name from name-version
-                name = "-".join(name_version.rsplit("-", 2)[:-2])
-                current = name_version.rsplit("-", 2)[-2]
-                updates.append(
-                    PackageUpdate(
-                        name=name, current_version=current, new_version=new_version
-                    )
-                )
+    @staticmethod
+    def _parse_yum_line(line: bytes) -> Optional[PackageUpdate]:
+        """Parse a line of `yum check-update --quiet` output."""
+        m = _YUM_RE.match(line)
+        if m is None:
+            return None
+        repository = m["repository"]
+        return PackageUpdate(
+            name=m["name"].decode(),
+            current_version="installed",
+            new_version=m["new_version"].decode(),
+            repository=repository.decode() if repository is not None else None,
+        )
 
-        return updates
+    @staticmethod
+    def _parse_apk_line(line: bytes) -> Optional[PackageUpdate]:
+        """Parse a line of `apk version -l '<'` output."""
+        m = _APK_RE.match(line)
+        if m is None:
+            return None
+        return PackageUpdate(
+            name=m["name"].decode(),
+            current_version=m["current_version"].decode(),
+            new_version=m["new_version"].decode(),
+        )
 
     async def apply_updates(
         self, packages: Optional[List[str]] = None
@@ -301,15 +573,56 @@ class SSHService:
         """
         sys_info = await self.get_system_info()
 
-        if sys_info.os_id in ("debian", "ubuntu", "linuxmint"):
-            return await self._apply_apt_updates(packages)
-        elif sys_info.os_id in ("centos", "rhel", "fedora", "rocky", "almalinux"):
-            return await self._apply_yum_updates(packages)
-        elif sys_info.os_id == "alpine":
-            return await self._apply_apk_updates(packages)
+        if sys_info.os_id in APT_OS_IDS:
+            success, output = await self._apply_apt_updates(packages)
+        elif sys_info.os_id in YUM_OS_IDS:
+            success, output = await self._apply_yum_updates(packages)
+        elif sys_info.os_id in APK_OS_IDS:
+            success, output = await self._apply_apk_updates(packages)
         else:
             return False, f"Unsupported OS: {sys_info.os_id}"
 
+        if success:
+            # Make the next check refresh the index and see the new state
+            self._index_refresh_ts.pop(self.host.id, None)
+            self._sysinfo_cache.pop(self._pool_key, None)
+
+        return success, output
+
+    @classmethod
+    async def apply_updates_many(
+        cls,
+        hosts: List[Tuple[Host, Optional[str], Optional[str]]],
+        concurrency: int = 20,
+    ) -> Dict[int, Union[Tuple[bool, str], Exception]]:
+        """
+        Apply all pending system updates on several hosts concurrently.
+
+        Args:
+            hosts: (host, private_key, password) for each host to update
+            concurrency: Hosts updated at once
+
+        Returns:
+            Dict of host id to its apply_updates() result, or the exception
+            it raised
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _apply(
+            host: Host, private_key: Optional[str], password: Optional[str]
+        ) -> Tuple[bool, str]:
+            async with semaphore:
+                service = cls(host, private_key, password)
+                try:
+                    return await service.apply_updates()
+                finally:
+                    await service.disconnect()
+
+        results = await asyncio.gather(
+            *(_apply(*entry) for entry in hosts), return_exceptions=True
+        )
+        return {entry[0].id: result for entry, result in zip(hosts, results)}
+
     async def _apply_apt_updates(
         self, packages: Optional[List[str]] = None
     ) -> Tuple[bool, str]:
@@ -3,12 +3,11 @@ Cryptographic utilities for SSH key encryption.
 """
 
 import base64
+import hashlib
 import secrets
-
+from collections import OrderedDict
 
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 
 def derive_key(password: str, salt: bytes) -> bytes:
@@ -22,13 +21,45 @@ def derive_key(password: str, salt: bytes) -> bytes:
     Returns:
         Derived key suitable for Fernet
     """
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=salt,
-        iterations=480000,
+    # Same PBKDF2-HMAC-SHA256 derivation as cryptography's PBKDF2HMAC, but
+    # straight through OpenSSL without the Python-level wrapper
+    key = base64.urlsafe_b64encode(
+        hashlib.pbkdf2_hmac("sha256", password.encode(), salt, 480000, dklen=32)
     )
-    key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+    return key
+
+
+# Keys the password fingerprints below; random per process so cache keys
+# are useless outside it
+_FINGERPRINT_KEY = secrets.token_bytes(32)
+
+# (password fingerprint, salt) -> derived key, least recently used first
+_derived_keys: "OrderedDict[tuple[bytes, bytes], bytes]" = OrderedDict()
+DERIVED_KEY_CACHE_SIZE = 128
+
+
+def _derive_key_cached(password: str, salt: bytes) -> bytes:
+    """
+    Derive an encryption key, reusing earlier derivations for the same
+    password and salt.
+
+    The cache is keyed by a keyed BLAKE2b fingerprint of the password, so
+    the raw password is never stored.
+    """
+    fingerprint = hashlib.blake2b(
+        password.encode(), key=_FINGERPRINT_KEY, digest_size=16
+    ).digest()
+    cache_key = (fingerprint, salt)
+
+    key = _derived_keys.get(cache_key)
+    if key is not None:
+        _derived_keys.move_to_end(cache_key)
+        return key
+
+    key = derive_key(password, salt)
+    _derived_keys[cache_key] = key
+    if len(_derived_keys) > DERIVED_KEY_CACHE_SIZE:
+        _derived_keys.popitem(last=False)
     return key
 
 
@@ -44,7 +75,7 @@ def encrypt_value(value: str, password: str) -> str:
         Encrypted value as base64 string (salt + ciphertext)
     """
     salt = secrets.token_bytes(16)
-    key = derive_key(password, salt)
+    key = _derive_key_cached(password, salt)
     fernet = Fernet(key)
 
     encrypted = fernet.encrypt(value.encode())
@@ -54,12 +85,36 @@ def encrypt_value(value: str, password: str) -> str:
     return base64.urlsafe_b64encode(combined).decode()
 
 
-def decrypt_value(encrypted: str, password: str) -> str:
+def batch_encrypt(values: list[str], password: str) -> list[str]:
+    """
+    Encrypt several values with one key derivation.
+
+    All values share one salt, so PBKDF2 runs once for the batch. Each result
+    still carries the salt and decrypts with decrypt_value().
+
+    Args:
+        values: Values to encrypt
+        password: Encryption password
+
+    Returns:
+        Encrypted values as base64 strings (salt + ciphertext), in order
+    """
+    salt = secrets.token_bytes(16)
+    key = _derive_key_cached(password, salt)
+    fernet = Fernet(key)
+
+    return [
+        base64.urlsafe_b64encode(salt + fernet.encrypt(value.encode())).decode()
+        for value in values
+    ]
+
+
+def decrypt_value(encrypted: str | bytes, password: str) -> str:
     """
     Decrypt a value using a password.
 
     Args:
-        encrypted: Encrypted base64 string
+        encrypted: Encrypted base64 string, as str or bytes
         password: Encryption password
 
     Returns:
@@ -68,13 +123,15 @@ def decrypt_value(encrypted: str, password: str) -> str:
     Raises:
         InvalidToken: If decryption fails (wrong password)
     """
-    combined = base64.urlsafe_b64decode(encrypted.encode())
+    if isinstance(encrypted, str):
+        encrypted = encrypted.encode("ascii")
+    combined = base64.urlsafe_b64decode(encrypted)
 
     # Extract salt and ciphertext
     salt = combined[:16]
     ciphertext = combined[16:]
 
-    key = derive_key(password, salt)
+    key = _derive_key_cached(password, salt)
     fernet = Fernet(key)
 
     return fernet.decrypt(ciphertext).decode()
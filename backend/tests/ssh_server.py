@@ -0,0 +1,70 @@
+"""
+In-process asyncssh server for tests, answering a fixed set of commands.
+"""
+
+import asyncssh
+
+from app.models.host import Host
+
+USERNAME = "dashboard"
+PASSWORD = "secret"
+
+OS_RELEASE = 'ID=debian\nVERSION_ID="12"\nPRETTY_NAME="Debian GNU/Linux 12"\n'
+UPGRADABLE = (
+    "openssl/stable-security 3.0.13-1~deb12u1 amd64 "
+    "[upgradable from: 3.0.11-1~deb12u2]\n"
+)
+COMMANDS = {
+    "cat /etc/os-release": OS_RELEASE,
+    "uname -r": "6.1.0-18-amd64\n",
+}
+
+
+class _Server(asyncssh.SSHServer):
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        return username == USERNAME and password == PASSWORD
+
+
+def _handle_process(process: asyncssh.SSHServerProcess) -> None:
+    command = process.command
+    if command.startswith("REFRESH_INDEX="):
+        # SSHService's update probe
+        output = f"###OS\n{OS_RELEASE}###UPGRADABLE\n{UPGRADABLE}"
+    elif command.startswith("sudo apt-get upgrade"):
+        output = "1 upgraded, 0 newly installed, 0 to remove\n"
+    else:
+        output = COMMANDS.get(command)
+
+    if output is None:
+        process.exit(127)
+        return
+    process.stdout.write(output)
+    process.exit(0)
+
+
+async def start_server() -> asyncssh.SSHAcceptor:
+    """Start a server on a free localhost port."""
+    return await asyncssh.create_server(
+        _Server,
+        "127.0.0.1",
+        0,
+        server_host_keys=[asyncssh.generate_private_key("ssh-ed25519")],
+        process_factory=_handle_process,
+    )
+
+
+def make_host(server: asyncssh.SSHAcceptor, host_id: int = 1) -> Host:
+    """Build an unsaved Host pointing at the server."""
+    return Host(
+        id=host_id,
+        name=f"test-{host_id}",
+        hostname="127.0.0.1",
+        ssh_port=server.sockets[0].getsockname()[1],
+        ssh_user=USERNAME,
+    )
@@ -0,0 +1,38 @@
+"""
+Tests for the SSH connection pool against an in-process asyncssh server.
+"""
+
+import asyncio
+
+from app.services.ssh_pool import is_connection_alive, ssh_pool
+from app.services.ssh_service import SSHService
+from ssh_server import PASSWORD, make_host, start_server
+
+
+def test_pooled_connection_lifecycle():
+    async def scenario():
+        server = await start_server()
+        try:
+            host = make_host(server)
+
+            service = SSHService(host, None, PASSWORD)
+            info = await service.get_system_info(use_cache=False)
+            conn = service._conn
+            assert info.os_id == "debian"
+            assert info.kernel == "6.1.0-18-amd64"
+            assert is_connection_alive(conn)
+            await service.disconnect()
+
+            # The next service for the same host reuses the idle connection
+            other = SSHService(host, None, PASSWORD)
+            assert await other.connect() is conn
+            await other.disconnect()
+
+            await ssh_pool.close_all()
+            await conn.wait_closed()
+            assert not is_connection_alive(conn)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
@@ -0,0 +1,60 @@
+"""
+Tests for the multi-host SSHService helpers against an in-process server.
+"""
+
+import asyncio
+
+import asyncssh
+
+from app.services.ssh_pool import ssh_pool
+from app.services.ssh_service import SSHService
+from ssh_server import PASSWORD, make_host, start_server
+
+
+def _run_against_server(coro_factory):
+    async def scenario():
+        server = await start_server()
+        try:
+            return await coro_factory(server)
+        finally:
+            await ssh_pool.close_all()
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(scenario())
+
+
+def test_check_updates_many():
+    async def check(server):
+        return await SSHService.check_updates_many(
+            [
+                (make_host(server, 1), None, PASSWORD),
+                (make_host(server, 2), None, "wrong"),
+            ]
+        )
+
+    results = _run_against_server(check)
+
+    [update] = results[1]
+    assert update.name == "openssl"
+    assert update.current_version == "3.0.11-1~deb12u2"
+    assert update.new_version == "3.0.13-1~deb12u1"
+    assert isinstance(results[2], asyncssh.PermissionDenied)
+
+
+def test_apply_updates_many():
+    async def apply(server):
+        results = await SSHService.apply_updates_many(
+            [
+                (make_host(server, 3), None, PASSWORD),
+                (make_host(server, 4), None, "wrong"),
+            ]
+        )
+        # Every service handed its connection back
+        return results, sum(len(idle) for idle in ssh_pool._idle.values())
+
+    results, idle = _run_against_server(apply)
+
+    assert results[3] == (True, "1 upgraded, 0 newly installed, 0 to remove\n")
+    assert isinstance(results[4], asyncssh.PermissionDenied)
+    assert idle == 1
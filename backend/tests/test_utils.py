@@ -0,0 +1,18 @@
+"""
+Tests for the encryption helpers.
+"""
+
+from app.utils import batch_encrypt, decrypt_value, encrypt_value
+
+
+def test_encrypt_roundtrip():
+    encrypted = encrypt_value("ssh-password", "master")
+    assert decrypt_value(encrypted, "master") == "ssh-password"
+
+
+def test_batch_encrypt_roundtrip():
+    values = ["key-one", "key-two", ""]
+    encrypted = batch_encrypt(values, "master")
+
+    assert len(set(encrypted)) == len(values)
+    assert [decrypt_value(value, "master") for value in encrypted] == values